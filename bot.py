@@ -1,4 +1,5 @@
 import os
+import asyncio
 import discord
 from discord.ext import commands
 
@@ -6,13 +7,16 @@ from game.storage import load_players
 from game.commands import setup_all_commands
 from game.arena import ARENAS
 
-# ================== LOAD PLAYER DATA ==================
-load_players()   # loads into storage.players
-
 # ================== DISCORD SETUP ==================
+class ClashBot(commands.Bot):
+    async def setup_hook(self) -> None:
+        # Load player data off the event loop so disk I/O doesn't stall the gateway handshake
+        await asyncio.to_thread(load_players)   # loads into storage.players
+
+
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = ClashBot(command_prefix="!", intents=intents)
 
 # Load all command modules
 setup_all_commands(bot)
@@ -25,14 +29,14 @@ async def on_ready():
 # ================== PLAYER UTILITY COMMANDS ==================
 @bot.command()
 async def show_arenas(ctx):
-    msg = "🏟️ Arenas:\n"
-    for arena_id, arena in ARENAS.items():
-        msg += (
-            f"- Arena {arena_id}: {arena['name']} "
-            f"(Unlock at {arena['unlock_trophies']} trophies)\n"
-            f"  Unlocks: {', '.join(arena['cards'])}\n"
-        )
-    await ctx.send(msg)
+    parts = ["🏟️ Arenas:"]
+    parts.extend(
+        f"- Arena {arena_id}: {arena['name']} "
+        f"(Unlock at {arena['unlock_trophies']} trophies)\n"
+        f"  Unlocks: {', '.join(arena['cards'])}"
+        for arena_id, arena in ARENAS.items()
+    )
+    await ctx.send("\n".join(parts) + "\n")
 
 # ================== RUN BOT ==================
 bot.run(os.getenv("DISCORD_TOKEN"))
@@ -2,10 +2,8 @@
 from __future__ import annotations
 
 import random
-from typing import Optional
 
-from game.card import Card, cards
-from game.rules import is_valid_deploy
+from game.card import Card
 from game.unit import make_unit_from_card
 from game.coords import rc_to_coord
 from game.visuals import render_arena_emoji
@@ -14,7 +12,7 @@ from game.visuals import render_arena_emoji
 async def process_ai_turn(ctx, match) -> None:
     """
     Simple AI:
-    - chooses a random playable NON-SPELL card
+    - chooses a random playable NON-SPELL card (weighted by elixir cost)
     - finds a random valid deploy tile on its side
     - plays it
     """
@@ -25,49 +23,44 @@ async def process_ai_turn(ctx, match) -> None:
     owner_id = ai.user.id
     arena = match.arena
 
-    # ----- gather playable NON-SPELL cards -----
-    playable: list[Card] = []
-    for name in ai.deck:
-        data = cards.get(name)
-        if not data:
-            continue
-        c = Card(name, data)
-        if c.type == "spell":
-            continue
-        if c.can_play(ai):
-            playable.append(c)
-
-    # helper to advance sim + render + win check
-    async def finish_turn() -> bool:
+    # ----- gather playable NON-SPELL cards (playable set is cached on the player) -----
+    playable: list[Card] = [c for c in ai.playable_cards() if c.type != "spell"]
+
+    # helper to advance sim + render + win check.
+    # Everything for the turn goes out in ONE message (each send is a Discord round trip).
+    async def finish_turn(prefix: str = "") -> bool:
         match.step_turn()
-        await ctx.send(render_arena_emoji(match.arena, match))
+        parts = [prefix] if prefix else []
+        parts.append(render_arena_emoji(match.arena, match))
 
         winner = match.check_win()
         if winner:
             # if you have end_match_channel in match.py, import it here instead
-            await ctx.send(f"🏆 **{winner.user.display_name} wins the match!**")
+            parts.append(f"🏆 **{winner.user.display_name} wins the match!**")
             match.active = False
+
+        await ctx.send("\n".join(parts))
+        if winner:
             return True
 
         match.next_turn()
         return False
 
     if not playable:
-        await ctx.send("🤖 **ClashAI** has no playable cards (elixir/cooldown) and skips.")
-        await finish_turn()
+        await finish_turn("🤖 **ClashAI** has no playable cards (elixir/cooldown) and skips.")
         return
 
-    card = random.choice(playable)
+    card = random.choices(playable, weights=[c.cost or 1 for c in playable])[0]
 
-    # ----- try to find a valid tile -----
-    placed = False
-    for _ in range(80):
-        r = random.randrange(0, arena.height)
-        c = random.randrange(0, arena.width)
-
-        if not is_valid_deploy(arena, owner_id, r, c):
-            continue
+    # ----- pick one of the valid tiles (enumerate once, choose once) -----
+    # Single pass over the flat grid against the owner's precomputed deploy mask.
+    w = arena.width
+    mask = arena.deploy_mask(owner_id)
+    valid = [divmod(i, w) for i, tile in enumerate(arena.grid) if tile is None and mask[i]]
 
+    announce = "🤖 **ClashAI** couldn't find a valid tile and skips."
+    if valid:
+        r, c = random.choice(valid)
         unit = make_unit_from_card(card, owner_id)
 
         if match.place_unit_for_player(owner_id, r, c, unit):
@@ -79,11 +72,6 @@ async def process_ai_turn(ctx, match) -> None:
             except Exception:
                 pos_txt = f"({r}, {c})"
 
-            await ctx.send(f"🤖 **ClashAI** played **{card.name}** at **{pos_txt}**")
-            placed = True
-            break
-
-    if not placed:
-        await ctx.send("🤖 **ClashAI** couldn't find a valid tile and skips.")
+            announce = f"🤖 **ClashAI** played **{card.name}** at **{pos_txt}**"
 
-    await finish_turn()
+    await finish_turn(announce)
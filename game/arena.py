@@ -1,8 +1,11 @@
 # game/arena.py
 from __future__ import annotations
 
-from typing import Optional, Iterator, Tuple, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Iterable, Iterator, Tuple, Dict, Any
 from game.card import CORE_CARD_NAMES
+from game.rules import build_deploy_mask
+from game.unit import Tile, TowerMarker, Unit
 
 
 # ---------------------------------------------------------
@@ -18,6 +21,18 @@ ARENAS: Dict[int, Dict[str, Any]] = {
 }
 
 
+# slots=True needs Python 3.10+ (see README)
+@dataclass(slots=True)
+class TowerState:
+    """HP/active state of one tower. Lives in Arena.towers (single source of truth)."""
+    hp: int
+    cells: Tuple[Tuple[int, int], ...]
+    emoji: str
+    active: bool
+    dmg: int = 90   # damage per shot (read by combat.tower_attacks)
+    rng: int = 6    # Manhattan range
+
+
 class Arena:
     """
     Arena owns:
@@ -30,6 +45,29 @@ class Arena:
       - combat rules (who attacks who)
     """
 
+    __slots__ = (
+        "width",
+        "height",
+        "grid",
+        "_back_grid",
+        "_blank_grid",
+        "_unit_cells",
+        "_unit_positions",
+        "_unit_bits",
+        "_tower_cells",
+        "p1_id",
+        "p2_id",
+        "river_cols",
+        "_river_set",
+        "towers",
+        "_dead_king",
+        "_tower_markers",
+        "_tower_pairs",
+        "_deploy_masks",
+        "status_units",
+        "revision",
+    )
+
     def __init__(
         self,
         width: int = 16,
@@ -41,18 +79,53 @@ class Arena:
         self.height = height
 
         # Grid stores ONLY markers:
-        # - units: {"type":"unit", ...}
-        # - towers: {"type":"tower","owner":id,"name":"left/right/king","emoji":"..."}
-        self.grid: list[list[Optional[dict]]] = [[None for _ in range(width)] for _ in range(height)]
+        # - units: Unit(...)
+        # - towers: TowerMarker(owner, "left/right/king", emoji)
+        # Row-major flat list: cell (r, c) lives at grid[r * width + c].
+        self.grid: list[Optional[Tile]] = [None] * (width * height)
+        # Spare grid for building the next tick (see back_buffer()/load_grid()), plus an
+        # all-None template to clear it with one C-level slice assignment.
+        self._back_grid: list[Optional[Tile]] = [None] * (width * height)
+        self._blank_grid: Tuple[None, ...] = (None,) * (width * height)
+
+        # Unit index: (row, col) -> unit tile, kept in sync by set()/load_grid()
+        # so unit scans cost O(#units) instead of a full W*H walk.
+        self._unit_cells: Dict[Tuple[int, int], Unit] = {}
+        # Reverse index: id(unit tile) -> (row, col), for find_unit_position()
+        self._unit_positions: Dict[int, Tuple[int, int]] = {}
+        # owner_id -> bitmask of flat cell indices holding that owner's units
+        # (Python ints as bitsets; "any enemy?" becomes an OR + truth test).
+        self._unit_bits: Dict[int, int] = {}
+
+        # Units with at least one active status effect (added by effects.py, pruned by
+        # tick_status_effects) so ticking statuses doesn't visit every unit.
+        self.status_units: set[Unit] = set()
+
+        # Bumped only when something shown on the board actually changes (which tile
+        # sits where, tower HP), so renderers can skip work (see match.show_arena).
+        self.revision = 0
+
+        # Cells currently holding a live tower marker (refreshed on place/destroy)
+        self._tower_cells: set[Tuple[int, int]] = set()
 
         self.p1_id = p1_id
         self.p2_id = p2_id
 
         # River is 2 columns wide in the middle (0-indexed)
-        self.river_cols = [self.width // 2 - 1, self.width // 2]
+        # (left, right) tuple, plus a set for O(1) membership
+        self.river_cols = (self.width // 2 - 1, self.width // 2)
+        self._river_set = frozenset(self.river_cols)
+
+        # owner_id -> static deployable-cell flags (see deploy_mask())
+        self._deploy_masks: Dict[int, list[bool]] = {}
 
         # Tower state lives here (single source of truth for HP/active)
-        self.towers: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        self.towers: Dict[int, Dict[str, TowerState]] = {}
+        self._dead_king: Optional[int] = None   # set by damage_tower when a king falls
+        # (state, in-bounds flat cell indices, TowerMarker) per tower; built by _init_towers
+        self._tower_markers: list[Tuple[TowerState, Tuple[int, ...], TowerMarker]] = []
+        # Flat (owner_id, tower_name, state) list of every tower; built by _init_towers
+        self._tower_pairs: list[Tuple[int, str, TowerState]] = []
         if p1_id is not None and p2_id is not None:
             self._init_towers(p1_id, p2_id)
             self.place_towers_on_grid()
@@ -63,100 +136,216 @@ class Arena:
     def _init_towers(self, p1_id: int, p2_id: int) -> None:
         """
         Creates tower state in a consistent format:
-          self.towers[owner_id][tower_name] = {"hp": int, "cells": [(r,c),...], "emoji": str, "active": bool}
+          self.towers[owner_id][tower_name] = TowerState(hp, cells=((r,c),...), emoji, active, dmg, rng)
         """
+        self._dead_king = None
         self.towers = {
             p1_id: {
-                "left":  {"hp": 1500, "cells": [(2, 3)],           "emoji": "🏰", "active": True},   # C4
-                "right": {"hp": 1500, "cells": [(9, 3)],           "emoji": "🏰", "active": True},   # J4
-                "king":  {"hp": 3000, "cells": [(5, 1), (6, 1)],   "emoji": "👑", "active": False},  # F2+G2
+                "left":  TowerState(hp=1500, cells=((2, 3),),          emoji="🏰", active=True),   # C4
+                "right": TowerState(hp=1500, cells=((9, 3),),          emoji="🏰", active=True),   # J4
+                "king":  TowerState(hp=3000, cells=((5, 1), (6, 1)),   emoji="👑", active=False, dmg=120, rng=7),  # F2+G2
             },
             p2_id: {
-                "left":  {"hp": 1500, "cells": [(2, 12)],          "emoji": "🏰", "active": True},   # C13
-                "right": {"hp": 1500, "cells": [(9, 12)],          "emoji": "🏰", "active": True},   # J13
-                "king":  {"hp": 3000, "cells": [(5, 14), (6, 14)], "emoji": "👑", "active": False},  # F15+G15
+                "left":  TowerState(hp=1500, cells=((2, 12),),         emoji="🏰", active=True),   # C13
+                "right": TowerState(hp=1500, cells=((9, 12),),         emoji="🏰", active=True),   # J13
+                "king":  TowerState(hp=3000, cells=((5, 14), (6, 14)), emoji="👑", active=False, dmg=120, rng=7),  # F15+G15
             },
         }
 
+        # Grid markers never change for a tower, so build them (and their flat indices) once.
+        h, w = self.height, self.width
+        self._tower_markers = [
+            (
+                t,
+                tuple(r * w + c for (r, c) in t.cells if 0 <= r < h and 0 <= c < w),
+                TowerMarker(owner_id, name, t.emoji),
+            )
+            for owner_id, tower_set in self.towers.items()
+            for name, t in tower_set.items()
+        ]
+        self._tower_pairs = [
+            (owner_id, name, t)
+            for owner_id, tower_set in self.towers.items()
+            for name, t in tower_set.items()
+        ]
+
     # -----------------------------
     # Grid helpers
     # -----------------------------
     def in_bounds(self, row: int, col: int) -> bool:
         return 0 <= row < self.height and 0 <= col < self.width
 
-    def get(self, row: int, col: int) -> Optional[dict]:
-        if not self.in_bounds(row, col):
+    # get/set/is_empty inline the bounds test: they run per cell in hot loops.
+    def get(self, row: int, col: int) -> Optional[Tile]:
+        w = self.width
+        if not (0 <= row < self.height and 0 <= col < w):
             return None
-        return self.grid[row][col]
+        return self.grid[row * w + col]
 
-    def set(self, row: int, col: int, value: Optional[dict]) -> None:
-        if not self.in_bounds(row, col):
+    def set(self, row: int, col: int, value: Optional[Tile]) -> None:
+        w = self.width
+        if not (0 <= row < self.height and 0 <= col < w):
             raise ValueError(f"Out of bounds: ({row}, {col})")
-        self.grid[row][col] = value
+        # Grid contract: only None / Unit / TowerMarker (hot loops rely on it; checked in debug)
+        assert value is None or isinstance(value, (Unit, TowerMarker)), value
+        i = row * w + col
+        pos = (row, col)
+        old = self.grid[i]
+        self.grid[i] = value
+        if old is not value:
+            self.revision += 1
+
+        # Only drop the old unit's position if it still points here
+        # (a unit that just moved away is already mapped to its new cell).
+        bits = self._unit_bits
+        if isinstance(old, Unit):
+            if self._unit_positions.get(id(old)) == pos:
+                del self._unit_positions[id(old)]
+            bits[old.owner] = bits.get(old.owner, 0) & ~(1 << i)
+
+        if isinstance(value, Unit):
+            self._unit_cells[pos] = value
+            self._unit_positions[id(value)] = pos
+            bits[value.owner] = bits.get(value.owner, 0) | (1 << i)
+        else:
+            self._unit_cells.pop(pos, None)
 
     def is_empty(self, row: int, col: int) -> bool:
-        return self.in_bounds(row, col) and self.grid[row][col] is None
+        w = self.width
+        return 0 <= row < self.height and 0 <= col < w and self.grid[row * w + col] is None
 
-    def place(self, row: int, col: int, obj: dict) -> bool:
+    def place(self, row: int, col: int, obj: Tile) -> bool:
         """Place an object if the cell is empty."""
         if not self.is_empty(row, col):
             return False
-        self.grid[row][col] = obj
+        self.set(row, col, obj)
         return True
 
-    def all_positions(self) -> Iterator[Tuple[int, int, Optional[dict]]]:
-        for r in range(self.height):
-            for c in range(self.width):
-                yield r, c, self.grid[r][c]
+    def back_buffer(self) -> list[Optional[Tile]]:
+        """
+        The spare grid, cleared, for building the next state in.
+        Hand it back with load_grid(); the two grids then swap roles (no per-tick allocation).
+        """
+        back = self._back_grid
+        back[:] = self._blank_grid
+        return back
 
-    def iter_units(self) -> Iterator[Tuple[int, int, dict]]:
-        """Iterate over all unit tiles on the grid."""
-        for r in range(self.height):
-            for c in range(self.width):
-                tile = self.grid[r][c]
-                if isinstance(tile, dict) and tile.get("type") == "unit":
-                    yield r, c, tile
+    def load_grid(self, grid: list[Optional[Tile]], touched: Optional[Iterable[int]] = None) -> None:
+        """
+        Replace the whole (flat) grid, e.g. after a movement step, and rebuild the unit index.
+        Use this instead of assigning arena.grid directly.
+
+        touched: every flat index that may hold a unit in `grid` (movement passes each
+        unit's old and target cell), so the index costs O(#units), not a W*H scan.
+        Omit it to scan the whole grid.
+        """
+        w = self.width
+        if grid is self._back_grid:
+            self._back_grid = self.grid
+        self.grid = grid
+        if touched is None:
+            touched = range(len(grid))
+
+        cells: Dict[Tuple[int, int], Unit] = {}
+        bits: Dict[int, int] = {}
+        for i in touched:
+            tile = grid[i]
+            if isinstance(tile, Unit):
+                cells[divmod(i, w)] = tile
+                bits[tile.owner] = bits.get(tile.owner, 0) | (1 << i)
+
+        # Same units on the same cells (Unit compares by identity) => board unchanged
+        if cells != self._unit_cells:
+            self.revision += 1
+        self._unit_cells = cells
+        self._unit_positions = {id(tile): pos for pos, tile in cells.items()}
+        self._unit_bits = bits
+
+    def unit_bits(self, owner_id: Optional[int]) -> int:
+        """Bitmask (bit i = flat cell i) of owner_id's units. 0 => none."""
+        return self._unit_bits.get(owner_id, 0)
+
+    def enemy_unit_bits(self, owner_id: Optional[int]) -> int:
+        """Bitmask (bit i = flat cell i) of every unit NOT owned by owner_id. 0 => no enemies."""
+        mask = 0
+        for owner, b in self._unit_bits.items():
+            if owner != owner_id:
+                mask |= b
+        return mask
+
+    def find_unit_position(self, unit: Unit) -> Optional[Tuple[int, int]]:
+        """(row, col) of this exact unit tile (identity, not equality), or None."""
+        return self._unit_positions.get(id(unit))
+
+    def all_positions(self) -> Iterator[Tuple[int, int, Optional[Tile]]]:
+        w = self.width
+        for i, tile in enumerate(self.grid):
+            r, c = divmod(i, w)
+            yield r, c, tile
+
+    def iter_units(self) -> Iterator[Tuple[int, int, Unit]]:
+        """Iterate over all unit tiles on the grid (snapshot, safe to mutate while iterating)."""
+        for (r, c), tile in list(self._unit_cells.items()):
+            yield r, c, tile
+
+    def deploy_mask(self, owner_id: int) -> list[bool]:
+        """Flat per-cell flags: may owner_id deploy here (if empty)? Built once per owner."""
+        mask = self._deploy_masks.get(owner_id)
+        if mask is None:
+            mask = self._deploy_masks[owner_id] = build_deploy_mask(self, owner_id)
+        return mask
 
     # -----------------------------
     # River helpers
     # -----------------------------
     def river_left_col(self) -> int:
-        return min(self.river_cols)
+        return self.river_cols[0]
 
     def river_right_col(self) -> int:
-        return max(self.river_cols)
+        return self.river_cols[1]
 
     def is_river_column(self, col: int) -> bool:
-        return col in self.river_cols
+        return col in self._river_set
 
     # -----------------------------
     # Tower helpers (grid markers + state access)
     # -----------------------------
     def is_tower_cell(self, row: int, col: int) -> bool:
-        tile = self.get(row, col)
-        return isinstance(tile, dict) and tile.get("type") == "tower"
+        return (row, col) in self._tower_cells
+
+    def live_tower_indices(self) -> Iterator[int]:
+        """Flat grid indices of every live tower cell (precomputed per tower, no set copy)."""
+        for t, indices, _ in self._tower_markers:
+            if t.hp > 0:
+                yield from indices
 
     def tower_at(self, row: int, col: int) -> Optional[Tuple[int, str]]:
         """
         If the cell contains a tower marker, return (owner_id, tower_name).
         Otherwise return None.
         """
-        tile = self.get(row, col)
-        if not isinstance(tile, dict) or tile.get("type") != "tower":
+        if (row, col) not in self._tower_cells:
             return None
-        return tile["owner"], tile["name"]
+        tile = self.grid[row * self.width + col]
+        return tile.owner, tile.name
+
+    def iter_live_towers(self) -> Iterator[Tuple[int, str, TowerState]]:
+        """(owner_id, tower_name, state) for every tower still standing."""
+        for entry in self._tower_pairs:
+            if entry[2].hp > 0:
+                yield entry
 
-    def tower_state(self, owner_id: int, tower_name: str) -> Dict[str, Any]:
+    def tower_state(self, owner_id: int, tower_name: str) -> TowerState:
         """Convenience accessor for tower state (HP/active/cells/emoji)."""
         return self.towers[owner_id][tower_name]
 
     def clear_towers_from_grid(self) -> None:
         """Remove all tower markers from the grid."""
-        for r in range(self.height):
-            for c in range(self.width):
-                tile = self.grid[r][c]
-                if isinstance(tile, dict) and tile.get("type") == "tower":
-                    self.grid[r][c] = None
+        for (r, c) in self._tower_cells:
+            self.grid[r * self.width + c] = None
+        if self._tower_cells:
+            self._tower_cells.clear()
+            self.revision += 1
 
     def place_towers_on_grid(self) -> None:
         """
@@ -168,18 +357,15 @@ class Arena:
 
         self.clear_towers_from_grid()
 
-        for owner_id, tower_set in self.towers.items():
-            for name, t in tower_set.items():
-                if t["hp"] <= 0:
-                    continue
-                for (r, c) in t["cells"]:
-                    if self.in_bounds(r, c):
-                        self.grid[r][c] = {
-                            "type": "tower",
-                            "owner": owner_id,
-                            "emoji": t["emoji"],
-                            "name": name,
-                        }
+        grid = self.grid
+        w = self.width
+        for t, indices, marker in self._tower_markers:
+            if t.hp <= 0:
+                continue
+            for i in indices:
+                grid[i] = marker
+                self._tower_cells.add(divmod(i, w))
+        self.revision += 1
 
     def damage_tower(self, owner_id: int, tower_name: str, dmg: int) -> None:
         """
@@ -187,31 +373,31 @@ class Arena:
         Also removes markers from grid when destroyed.
         """
         t = self.towers[owner_id][tower_name]
-        if t["hp"] <= 0:
+        if t.hp <= 0:
             return
 
         # If king is hit, activate it
         if tower_name == "king":
-            t["active"] = True
+            t.active = True
 
-        t["hp"] -= dmg
-        if t["hp"] <= 0:
-            t["hp"] = 0
+        t.hp -= dmg
+        self.revision += 1
+        if t.hp <= 0:
+            t.hp = 0
 
             # Remove all its cells from the grid
-            for (r, c) in t["cells"]:
+            for (r, c) in t.cells:
                 if self.in_bounds(r, c):
-                    self.grid[r][c] = None
+                    self.grid[r * self.width + c] = None
+                self._tower_cells.discard((r, c))
 
             # If a princess dies => king activates
             if tower_name in ("left", "right"):
-                self.towers[owner_id]["king"]["active"] = True
+                self.towers[owner_id]["king"].active = True
+            elif tower_name == "king" and self._dead_king is None:
+                self._dead_king = owner_id
 
     def any_king_dead(self) -> Optional[int]:
-        """Return the owner_id whose king is dead, else None."""
-        if not self.towers:
-            return None
-        for owner_id, tower_set in self.towers.items():
-            if tower_set["king"]["hp"] <= 0:
-                return owner_id
-        return None
+        """Return the owner_id whose king is dead, else None (cached by damage_tower)."""
+        return self._dead_king
+
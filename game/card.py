@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import sys
+import types
+
+from game.unit import Unit
+
 
 class Card:
     """
@@ -10,6 +15,19 @@ class Card:
     They create units, buildings, or spells that act on the grid.
     """
 
+    __slots__ = (
+        "name",
+        "type",
+        "cost",
+        "damage",
+        "hp",
+        "range",
+        "speed",
+        "special",
+        "emoji",
+        "image",
+    )
+
     def __init__(self, name: str, data: dict):
         if not data:
             raise ValueError(f"Card data missing for '{name}'")
@@ -45,6 +63,15 @@ class Card:
     # Grid-based unit creation
     # ---------------------------------------------------------
 
+    def create_unit(self, owner_id: int) -> Unit:
+        """Fresh grid unit tile for this card."""
+        if self.type == "spell":
+            raise ValueError("Spells do not create units. Handle spells separately.")
+        return Unit(
+            self.name, self.type, owner_id,
+            self.hp, self.damage, self.range, self.speed,
+            self.special, self.emoji,
+        )
 
     def __str__(self):
         return f"{self.name} (Cost: {self.cost})"
@@ -54,7 +81,7 @@ class Card:
 # CORE CARD SET (small on purpose while building the engine)
 # =========================================================
 
-CORE_CARD_NAMES = [
+CORE_CARD_NAMES = tuple(sys.intern(n) for n in (
     # Troops
     "knight",
     "archer",
@@ -72,7 +99,7 @@ CORE_CARD_NAMES = [
     "fireball",
     "zap",
     "freeze",
-]
+))
 
 # ---------------------------------------------------------
 # CARD DATABASE (CORE 12)
@@ -133,3 +160,16 @@ cards = {
         "special": "freeze", "emoji": "❄️"
     },
 }
+
+# Read-only view with interned names: the DB never changes at runtime, and
+# interned keys make lookups with interned command args a pointer compare.
+cards = types.MappingProxyType({sys.intern(name): data for name, data in cards.items()})
+
+# Every known card name, for set-based validation (deck_build, storage)
+CARD_NAME_SET = frozenset(cards)
+
+# ---------------------------------------------------------
+# Shared Card instances (card data never changes at runtime)
+# ---------------------------------------------------------
+
+CARD_OBJECTS = {name: Card(name, data) for name, data in cards.items() if data}
@@ -1,148 +1,152 @@
 # game/combat.py
 from __future__ import annotations
-from typing import Optional, Tuple, List
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
 from game.rules import is_enemy
+from game.unit import Tile, TowerMarker, Unit
 
 
 # -----------------------------
 # Generic helpers
 # -----------------------------
 
-def is_tower(tile: object) -> bool:
-    return isinstance(tile, dict) and tile.get("type") == "tower"
+# Grid contract (see Arena): every non-None tile is a Unit or a TowerMarker,
+# so a single isinstance() tells them apart and fields are plain attributes.
 
+def is_tower(tile: Optional[Tile]) -> bool:
+    return isinstance(tile, TowerMarker)
 
-def is_unit(tile: object) -> bool:
-    return isinstance(tile, dict) and tile.get("type") != "tower"
 
+def is_unit(tile: Optional[Tile]) -> bool:
+    return isinstance(tile, Unit)
 
-def can_attack(attacker: dict, target: dict) -> bool:
+
+def can_attack(attacker: Unit, target: Tile) -> bool:
     """
-    Prevent friendly fire. This is the ONE place ownership rules live.
+    Prevent friendly fire. This is the ONE place ownership rules live;
+    the per-hit paths below inline the same compare (tile owners are always set).
     """
-    return is_enemy(attacker.get("owner"), target.get("owner"))
+    return is_enemy(attacker.owner, target.owner)
 
 
 # -----------------------------
 # Unit attacks
 # -----------------------------
 
-def attack_unit(attacker: dict, target_r: int, target_c: int, grid: list[list]) -> None:
+def attack_unit(attacker: Unit, target_i: int, grid: list) -> None:
     """
-    Attack a unit at (target_r, target_c) on the provided grid (usually 'new_grid' for current tick).
+    Attack a unit at flat index target_i on the provided grid (usually 'new_grid' for current tick).
     """
-    target = grid[target_r][target_c]
-    if not isinstance(target, dict) or is_tower(target):
-        return
-
-    if not can_attack(attacker, target):
+    target = grid[target_i]
+    if not isinstance(target, Unit) or target.owner == attacker.owner:
         return
 
-    dmg = int(attacker.get("damage", 0) or 0)
-    target["hp"] = int(target.get("hp", 0) or 0) - dmg
+    target.hp -= attacker.damage
+    if target.hp <= 0:
+        grid[target_i] = None
 
-    if target["hp"] <= 0:
-        grid[target_r][target_c] = None
 
-
-def attack_tower(match, attacker: dict, tower_tile: dict) -> None:
+def attack_tower(match, attacker: Unit, tower_tile: TowerMarker) -> None:
     """
     Damage a tower using Arena's single source of truth.
     """
-    if not isinstance(tower_tile, dict) or tower_tile.get("type") != "tower":
+    if not isinstance(tower_tile, TowerMarker):
         return
 
-    if not can_attack(attacker, tower_tile):
+    owner = tower_tile.owner
+    if owner == attacker.owner:
         return
 
-    owner = tower_tile["owner"]
-    name = tower_tile["name"]
-
-    dmg = int(attacker.get("damage", 0) or 0)
-    match.arena.damage_tower(owner, name, dmg)
+    match.arena.damage_tower(owner, tower_tile.name, attacker.damage)
 
 
 # -----------------------------
 # Tower attacks (your logic, moved from match.py)
 # -----------------------------
 
+@lru_cache(maxsize=None)
+def _offsets_within(rng: int) -> Tuple[Tuple[int, int, int], ...]:
+    """(dist, dr, dc) for every offset with Manhattan distance <= rng, nearest first."""
+    return tuple(sorted(
+        (abs(dr) + abs(dc), dr, dc)
+        for dr in range(-rng, rng + 1)
+        for dc in range(-rng, rng + 1)
+        if abs(dr) + abs(dc) <= rng
+    ))
+
+
 def tower_attacks(match) -> None:
     """
     Towers shoot nearest enemy unit in range.
     King shoots only when active.
     """
     arena = match.arena
-    if not getattr(arena, "towers", None):
-        return
 
-    for owner_id, tower_set in arena.towers.items():
-        if not isinstance(tower_set, dict):
+    # Hoist global/attribute lookups out of the per-tower loop (LOAD_FAST in the body)
+    offsets_within = _offsets_within
+    enemy_unit_bits = arena.enemy_unit_bits
+    arena_get = arena.get
+    arena_set = arena.set
+    in_bounds = arena.in_bounds
+    h, w = arena.height, arena.width
+
+    # Enemy-unit bitmask per shooting side, computed once per tick and patched
+    # on kills, instead of rebuilding it from the arena for every tower.
+    enemy_bits_for: Dict[int, int] = {}
+
+    for owner_id, name, t in arena.iter_live_towers():
+        # King only shoots when active
+        if name == "king" and not t.active:
             continue
 
-        for name, t in tower_set.items():
-            if not isinstance(t, dict):
-                continue
+        cells = t.cells
+        if not cells:
+            continue
 
-            hp = int(t.get("hp", 0) or 0)
-            if hp <= 0:
-                continue
+        # Nobody to shoot at => nothing to probe.
+        enemy_bits = enemy_bits_for.get(owner_id)
+        if enemy_bits is None:
+            enemy_bits = enemy_bits_for[owner_id] = enemy_unit_bits(owner_id)
+        if not enemy_bits:
+            continue
 
-            # King only shoots when active
-            if name == "king" and not bool(t.get("active", False)):
-                continue
+        dmg = t.dmg
+        offsets = offsets_within(t.rng)
 
-            cells = t.get("cells")
-            if not isinstance(cells, list) or not cells:
-                continue
+        best_target: Optional[Tuple[int, int]] = None
+        best_dist = 10**9
 
-            dmg = 120 if name == "king" else 90
-            rng = 7 if name == "king" else 6
-
-            # Pre-scan enemy units once
-            enemies: List[Tuple[int, int]] = []
-            for r in range(arena.height):
-                for c in range(arena.width):
-                    tile = arena.get(r, c)
-                    if not isinstance(tile, dict):
-                        continue
-                    if tile.get("type") == "tower":
-                        continue
-                    if tile.get("owner") == owner_id:
-                        continue
-                    enemies.append((r, c))
-
-            if not enemies:
+        # Probe the range ball around each tower cell nearest-first; the first enemy
+        # hit is that cell's closest target. Earlier cells win ties (strict <), and
+        # the (dist, dr, dc) ordering keeps row-major tie-breaking within a cell.
+        for (tr, tc) in cells:
+            if not in_bounds(tr, tc):
                 continue
 
-            best_target: Optional[Tuple[int, int]] = None
-            best_dist = 10**9
-
-            # Use the closest tower cell as origin
-            for (tr, tc) in cells:
-                if not arena.in_bounds(tr, tc):
+            for dist, dr, dc in offsets:
+                if dist >= best_dist:
+                    break
+                er = tr + dr
+                ec = tc + dc
+                if not (0 <= er < h and 0 <= ec < w):
                     continue
+                if enemy_bits >> (er * w + ec) & 1:
+                    best_dist = dist
+                    best_target = (er, ec)
+                    break
 
-                for (er, ec) in enemies:
-                    dist = abs(er - tr) + abs(ec - tc)
-                    if dist <= rng and dist < best_dist:
-                        best_dist = dist
-                        best_target = (er, ec)
-
-            if best_target is None:
-                continue
-
-            r, c = best_target
-            target = arena.get(r, c)
-            if not isinstance(target, dict):
-                continue
-            if target.get("type") == "tower":
-                continue
-
-            # Friendly fire guard (should already be enemy, but keep safe)
-            if not is_enemy(owner_id, target.get("owner")):
-                continue
+        if best_target is None:
+            continue
 
-            target["hp"] = int(target.get("hp", 0) or 0) - dmg
-            if target["hp"] <= 0:
-                arena.set(r, c, None)
+        # enemy_bits only marks cells holding enemy Units, so no type/owner re-check
+        r, c = best_target
+        target = arena_get(r, c)
+
+        target.hp -= dmg
+        if target.hp <= 0:
+            arena_set(r, c, None)
+            # Later towers this tick must not see the dead unit
+            alive = ~(1 << (r * w + c))
+            for side in enemy_bits_for:
+                enemy_bits_for[side] &= alive
@@ -1,9 +1,12 @@
 # game/commands/deck_cmds.py
 
+import io
+import sys
+
 from discord.ext import commands
 from game.player import get_player
-from game.card import cards
-from game.visuals import make_deck_image
+from game.card import cards, CARD_NAME_SET
+from game.visuals import make_deck_image_async
 from game.storage import players   # ✅ import global players dict
 import discord
 
@@ -16,6 +19,7 @@ def setup_deck_cmds(bot: commands.Bot):
     @bot.command()
     async def deck_build(ctx, *card_names):
         player = get_player(ctx.author, players)
+        card_names = tuple(sys.intern(c) for c in card_names)
 
         # Validate deck size
         if len(card_names) < 5:
@@ -25,14 +29,16 @@ def setup_deck_cmds(bot: commands.Bot):
             await ctx.send("Deck can have a maximum of 8 cards.")
             return
 
-        # Validate card existence
-        for c in card_names:
-            if c not in cards:
-                await ctx.send(f"❌ Unknown card: `{c}`")
-                return
+        # Validate card existence (one set difference, report every bad name at once)
+        names = set(card_names)
+        unknown = names - CARD_NAME_SET
+        if unknown:
+            listed = ", ".join(f"`{c}`" for c in sorted(unknown))
+            await ctx.send(f"❌ Unknown card{'s' if len(unknown) > 1 else ''}: {listed}")
+            return
 
         # Validate unlocks
-        if any(c not in player.cards for c in card_names):
+        if not names <= player.cards_set:
             await ctx.send("❌ You tried to add cards you haven't unlocked yet.")
             return
 
@@ -68,12 +74,14 @@ def setup_deck_cmds(bot: commands.Bot):
             if c in cards and "image" in cards[c]:
                 card_files.append(cards[c]["image"])
 
-        deck_file = make_deck_image(card_files)
+        # Off the event loop, encoded in memory: nothing is left on disk per request
+        deck_file = await make_deck_image_async(card_files, io.BytesIO())
 
         if not deck_file:
             await ctx.send("⚠️ No images found for your deck.")
             return
 
+        deck_file.seek(0)
         file = discord.File(deck_file, filename="deck.png")
         embed = discord.Embed(title=f"📦 {ctx.author.display_name}'s Deck")
         embed.set_image(url="attachment://deck.png")
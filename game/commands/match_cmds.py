@@ -3,14 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import sys
 from discord.ext import commands
 
 from game.storage import players
-from game.visuals import render_arena_emoji
 from game.player import get_player
-from game.match import Match, end_match, realtime_loop
+from game.match import Match, PLACE_TIMEOUT, realtime_loop
 from game.arena import ARENAS
-from game.card import Card, cards
+from game.card import CARD_OBJECTS
 from game.coords import coord_to_rc, rc_to_coord
 
 
@@ -40,29 +40,28 @@ def setup_match_cmds(bot: commands.Bot):
 
         ai_player = get_player(ai_user, players)
         ai_player.is_ai = True
-        ai_player.cards = ARENAS[1]["cards"]
+        ai_player.cards = list(ARENAS[1]["cards"])
         ai_player.deck = ai_player.cards[:5]
 
         # Create match ONCE
         match = Match(human, ai_player)
         matches[ctx.channel.id] = match
 
-        # Start realtime loop
-        match.loop_task = asyncio.create_task(realtime_loop(bot, ctx.channel.id, match))
-
         await ctx.send(
             f"🤖 {ctx.author.mention} started a real-time match vs **{ai_player.user.display_name}**!\n"
             f"Play anytime with `!cr_play <card> <pos>` (example: `!cr_play knight C4`)."
         )
 
-        # Show initial arena
-        await ctx.send(render_arena_emoji(match.arena, match))
+        # Start realtime loop. It owns the board message: its first tick posts it
+        # (below the announcement), later renders edit it.
+        match.loop_task = asyncio.create_task(realtime_loop(bot, ctx.channel.id, match))
 
     # ---------------------------------------------------------
     # PLAY A CARD
     # ---------------------------------------------------------
     @bot.command()
     async def cr_play(ctx, card_name: str, pos: str):
+        card_name = sys.intern(card_name)
         match = matches.get(ctx.channel.id)
         if not match or not match.active:
             await ctx.send("❌ No active match.")
@@ -82,47 +81,36 @@ def setup_match_cmds(bot: commands.Bot):
         if card_name not in player.deck:
             await ctx.send("❌ Card not in your deck.")
             return
-        if card_name not in cards:
+        card = CARD_OBJECTS.get(card_name)
+        if card is None:
             await ctx.send("❌ Unknown card.")
             return
 
-        card = Card(card_name, cards[card_name])
         if not card.can_play(player):
             await ctx.send("❌ Can't play this card (elixir/cooldown).")
             return
 
-        unit = card.create_unit(player.user.id)
-
-        async with match.lock:
-            # placement rules (your-side + not river)
-            if hasattr(match, "is_valid_deploy") and not match.is_valid_deploy(player.user.id, row, col):
-                ok = False
-                reason = "❌ You can only deploy on your side (not on river/bridge)."
-            else:
-                ok = match.place_unit_for_player(player.user.id, row, col, unit)
-                reason = "❌ Invalid placement (occupied or out of bounds)."
-
-            if not ok:
-                # don't spend elixir
-                pass
-            else:
-                card.apply_cost(player)
-                player.add_cooldown(card.name)
-
-        if not ok:
+        # The realtime loop places it (and spends elixir) on its next tick.
+        # Bounded wait: if the loop has died, don't hang the command forever.
+        try:
+            reason = await asyncio.wait_for(match.queue_placement(player, card, row, col), PLACE_TIMEOUT)
+        except asyncio.TimeoutError:
+            await ctx.send("❌ The match isn't responding; try again.")
+            return
+        if reason:
             await ctx.send(reason)
             return
 
+        # Board itself is shown by realtime_loop's throttled render
         await ctx.send(f"🎮 {ctx.author.mention} played **{card.name}** at {rc_to_coord(row, col)}")
-        await ctx.send(render_arena_emoji(match.arena, match))
 
     # ---------------------------------------------------------
     # LEADERBOARD
     # ---------------------------------------------------------
     @bot.command()
     async def cr_leaderboard(ctx):
-        from game.storage import load_players
-        loaded = load_players()
+        from game.storage import read_players
+        loaded = read_players()
 
         if not loaded:
             await ctx.send("No players yet.")
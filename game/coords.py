@@ -1,6 +1,19 @@
 # game/coords.py
 from __future__ import annotations
-from typing import Optional, Tuple
+
+import re
+from typing import Dict, Optional, Tuple
+
+
+# Every coordinate the board can have (rows A-Z, columns 1-64), built once.
+# Lookups hit these; anything else falls back to the parsing below.
+_COORD_LUT: Dict[str, Tuple[int, int]] = {
+    f"{chr(ord('A') + r)}{c + 1}": (r, c) for r in range(26) for c in range(64)
+}
+_RC_LUT: Dict[Tuple[int, int], str] = {rc: coord for coord, rc in _COORD_LUT.items()}
+
+# Fallback format check: one ASCII row letter + 1-based column number
+_COORD_RE = re.compile(r"([A-Z])([0-9]+)")
 
 
 def coord_to_rc(pos: str) -> Optional[Tuple[int, int]]:
@@ -12,26 +25,27 @@ def coord_to_rc(pos: str) -> Optional[Tuple[int, int]]:
         return None
 
     pos = pos.strip().upper()
-    if len(pos) < 2:
-        return None
-
-    row_char = pos[0]
-    col_part = pos[1:]
+    hit = _COORD_LUT.get(pos)
+    if hit is not None:
+        return hit
 
-    if not row_char.isalpha() or not col_part.isdigit():
+    # Off-table input (zero-padded / out-of-board columns): one precompiled match
+    m = _COORD_RE.fullmatch(pos)
+    if m is None:
         return None
 
-    row = ord(row_char) - ord("A")
-    col = int(col_part) - 1  # 1-based -> 0-based
-
-    if row < 0 or col < 0:
+    col = int(m[2]) - 1  # 1-based -> 0-based
+    if col < 0:
         return None
 
-    return row, col
+    return ord(m[1]) - ord("A"), col
 
 
 def rc_to_coord(row: int, col: int) -> str:
     """
     Convert (row, col) into board coordinate like 'A1'.
     """
+    hit = _RC_LUT.get((row, col))
+    if hit is not None:
+        return hit
     return f"{chr(ord('A') + row)}{col + 1}"
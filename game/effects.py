@@ -1,6 +1,7 @@
 # game/effects.py
 from __future__ import annotations
-from typing import Dict, Any
+
+from game.unit import Unit
 
 
 # ---- Effect keys (prevents typos) ----
@@ -23,16 +24,9 @@ def apply_spell_effect(
     No direct damage here.
     """
 
-    if effect == "freeze":
-        _apply_freeze(arena, center)
-
-    elif effect == "zap":
-        _apply_stun(arena, center)
-
-    elif effect == "rage":
-        _apply_rage(arena, center)
-
-    # Add more spells here
+    handler = _SPELL_EFFECTS.get(effect)
+    if handler is not None:
+        handler(arena, center)
 
 
 # -----------------------------
@@ -46,37 +40,35 @@ def _apply_freeze(arena, center: tuple[int, int] | None):
     if center is None:
         return
 
-    for r, c, tile in arena.all_positions():
-        if not isinstance(tile, dict):
-            continue
-        if tile.get("type") != "unit":
-            continue
-
-        if _in_radius((r, c), center, radius=1):
-            tile["status"] = tile.get("status", {})
-            tile["status"][EFFECT_FROZEN] = 2  # ticks
+    for tile in _units_in_box(arena, center, radius=1):
+        tile.status[EFFECT_FROZEN] = 2  # ticks
+        arena.status_units.add(tile)
 
 
 def _apply_stun(arena, center: tuple[int, int] | None):
     if center is None:
         return
 
-    for r, c, tile in arena.all_positions():
-        if isinstance(tile, dict) and tile.get("type") == "unit":
-            if _in_radius((r, c), center, radius=0):
-                tile["status"] = tile.get("status", {})
-                tile["status"][EFFECT_STUNNED] = 1
+    for tile in _units_in_box(arena, center, radius=0):
+        tile.status[EFFECT_STUNNED] = 1
+        arena.status_units.add(tile)
 
 
 def _apply_rage(arena, center: tuple[int, int] | None):
     if center is None:
         return
 
-    for r, c, tile in arena.all_positions():
-        if isinstance(tile, dict) and tile.get("type") == "unit":
-            if _in_radius((r, c), center, radius=1):
-                tile["status"] = tile.get("status", {})
-                tile["status"][EFFECT_RAGE] = 3
+    for tile in _units_in_box(arena, center, radius=1):
+        tile.status[EFFECT_RAGE] = 3
+        arena.status_units.add(tile)
+
+
+# Spell name -> handler(arena, center). Add more spells here.
+_SPELL_EFFECTS = {
+    "freeze": _apply_freeze,
+    "zap": _apply_stun,
+    "rage": _apply_rage,
+}
 
 
 # -----------------------------
@@ -87,28 +79,39 @@ def tick_status_effects(arena) -> None:
     """
     Decrease status timers and remove expired effects.
     """
-    for _, _, tile in arena.all_positions():
-        if not isinstance(tile, dict):
-            continue
-
-        status: Dict[str, int] = tile.get("status", {})
-        expired = []
-
-        for name, turns in status.items():
-            status[name] -= 1
-            if status[name] <= 0:
-                expired.append(name)
+    units = arena.status_units
+    if not units:  # common case: nobody is frozen/stunned/raged
+        return
 
-        for e in expired:
-            del status[e]
+    for tile in list(units):
+        # Died / removed since the effect was applied
+        if arena.find_unit_position(tile) is None:
+            units.discard(tile)
+            continue
 
-        if not status:
-            tile.pop("status", None)
+        # One pass: decrement every timer and drop the ones that hit 0
+        tile.status = {name: turns - 1 for name, turns in tile.status.items() if turns > 1}
+        if not tile.status:
+            units.discard(tile)
 
 
 # -----------------------------
 # Helpers
 # -----------------------------
 
-def _in_radius(a: tuple[int, int], b: tuple[int, int], radius: int) -> bool:
-    return abs(a[0] - b[0]) <= radius and abs(a[1] - b[1]) <= radius
+def _units_in_box(arena, center: tuple[int, int], radius: int) -> list[Unit]:
+    """
+    Units within `radius` (Chebyshev distance) of center.
+    Reads only the clamped (2r+1)x(2r+1) window of the grid, not every unit/cell.
+    """
+    r0, c0 = center
+    w = arena.width
+    grid = arena.grid
+    found: list[Unit] = []
+    for r in range(max(0, r0 - radius), min(arena.height, r0 + radius + 1)):
+        row_start = r * w
+        for c in range(max(0, c0 - radius), min(w, c0 + radius + 1)):
+            tile = grid[row_start + c]
+            if isinstance(tile, Unit):
+                found.append(tile)
+    return found
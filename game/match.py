@@ -3,16 +3,22 @@ from __future__ import annotations
 
 from typing import Optional
 import asyncio
+import logging
 import time
 
+import discord
+
 from game.movement import step_movement
 from game.arena import Arena
 from game.player import Player
 from game.combat import tower_attacks
 from game.rules import is_valid_deploy
+from game.unit import Unit
 from game.visuals import render_arena_emoji
+from game.card import Card
 
 
+log = logging.getLogger(__name__)
 
 # ---------------------------------------------------------
 # Tunables
@@ -20,6 +26,11 @@ from game.visuals import render_arena_emoji
 TICK_SECONDS = 0.25      # simulation tick rate (4 ticks/sec)
 ELIXIR_EVERY = 1.0       # +1 elixir per second
 RENDER_EVERY = 1.5       # send board every 1.5s (prevents spam)
+PLACE_TIMEOUT = 5.0      # max wait for the loop to apply a queued card play
+
+# The loop runs on a fixed deadline schedule, so the timers above are whole tick counts
+ELIXIR_TICKS = max(1, round(ELIXIR_EVERY / TICK_SECONDS))
+RENDER_TICKS = max(1, round(RENDER_EVERY / TICK_SECONDS))
 
 
 class Match:
@@ -27,7 +38,7 @@ class Match:
     Match owns:
       - players + match lifecycle (active, winner)
       - calling step functions (movement/combat/towers)
-      - thread safety lock for realtime loop + commands
+      - queue of pending placements (commands enqueue, realtime loop applies)
 
     Match does NOT own (but may call):
       - deploy rules (rules.py)
@@ -39,14 +50,29 @@ class Match:
         self.players = [p1, p2]
         self.active = True
 
+        # id lookups for the win-check path (p1 inserted last so it wins if both share an id,
+        # matching the old scan order)
+        self._by_id = {p2.user.id: p2, p1.user.id: p1}
+        self._opponent_of = {p2.user.id: p1.user.id, p1.user.id: p2.user.id}
+
         # You can remove "turn_index" later; kept for compatibility with existing commands/AI
         self.turn_index = 0
 
         self.arena = Arena(width=16, height=10, p1_id=p1.user.id, p2_id=p2.user.id)
 
-        self.lock = asyncio.Lock()
         self.loop_task: Optional[asyncio.Task] = None
 
+        # Placements from commands, applied by realtime_loop at the top of each tick,
+        # so the loop is the single writer for grid/elixir/cooldowns (no lock hand-off
+        # on the command path). Items: (player, card, row, col, future).
+        self.place_queue: asyncio.Queue = asyncio.Queue()
+
+        # The one board message we keep editing (see show_arena), and what it shows
+        self.arena_message: Optional[discord.Message] = None
+        self.last_rendered: str = ""
+        # (arena revision, energies) of the last render; unchanged => skip rendering
+        self.last_render_key: Optional[tuple] = None
+
     # -----------------------------------------------------
     # BASIC HELPERS
     # -----------------------------------------------------
@@ -57,17 +83,10 @@ class Match:
         return self.players[1 - self.turn_index]
 
     def get_player_by_id(self, user_id: int) -> Optional[Player]:
-        for p in self.players:
-            if p.user.id == user_id:
-                return p
-        return None
+        return self._by_id.get(user_id)
 
     def opponent_id(self, user_id: int) -> Optional[int]:
-        if self.players[0].user.id == user_id:
-            return self.players[1].user.id
-        if self.players[1].user.id == user_id:
-            return self.players[0].user.id
-        return None
+        return self._opponent_of.get(user_id)
 
     def next_turn(self) -> None:
         self.turn_index = 1 - self.turn_index
@@ -75,7 +94,7 @@ class Match:
     # -----------------------------------------------------
     # UNIT PLACEMENT
     # -----------------------------------------------------
-    def place_unit_for_player(self, owner_id: int, row: int, col: int, unit: dict) -> bool:
+    def place_unit_for_player(self, owner_id: int, row: int, col: int, unit: Unit) -> bool:
         """
         Place a unit/building tile on the grid if valid.
         Spells should be handled elsewhere (effects.py).
@@ -83,17 +102,60 @@ class Match:
         if not is_valid_deploy(self.arena, owner_id, row, col):
             return False
 
-        # Ensure ownership & minimum defaults (until everything uses unit.py spawn)
-        unit["owner"] = owner_id
-        unit.setdefault("hp", 100)
-        unit.setdefault("damage", 50)
-        unit.setdefault("range", 1)
-        unit.setdefault("speed", 1)
-        unit.setdefault("emoji", "🤺")
+        # Ensure ownership (Unit always carries the rest of its stats)
+        unit.owner = owner_id
 
         self.arena.set(row, col, unit)
         return True
 
+    def queue_placement(self, player: Player, card: Card, row: int, col: int) -> asyncio.Future:
+        """
+        Queue a card play for the realtime loop.
+        The returned future resolves to None once placed, or to an error message.
+        """
+        fut = asyncio.get_running_loop().create_future()
+        if self.loop_task is not None and self.loop_task.done():
+            # Nobody will ever drain the queue
+            fut.set_result("❌ No active match.")
+            return fut
+        self.place_queue.put_nowait((player, card, row, col, fut))
+        return fut
+
+    def apply_queued_placements(self) -> None:
+        """Drain the placement queue in arrival order (called by realtime_loop)."""
+        q = self.place_queue
+        while not q.empty():
+            player, card, row, col, fut = q.get_nowait()
+            if fut.done():  # caller gave up
+                continue
+
+            # Re-check: elixir/cooldowns may have changed since the command ran
+            if not card.can_play(player):
+                fut.set_result("❌ Can't play this card (elixir/cooldown).")
+                continue
+
+            try:
+                unit = card.create_unit(player.user.id)
+            except ValueError as e:  # spells don't become units
+                fut.set_result(f"❌ {e}")
+                continue
+
+            if not self.place_unit_for_player(player.user.id, row, col, unit):
+                fut.set_result("❌ Invalid placement (occupied or out of bounds).")
+                continue
+
+            card.apply_cost(player)
+            player.add_cooldown(card.name)
+            fut.set_result(None)
+
+    def reject_queued_placements(self, reason: str) -> None:
+        """Resolve every still-queued placement with `reason` (match is over)."""
+        q = self.place_queue
+        while not q.empty():
+            *_, fut = q.get_nowait()
+            if not fut.done():
+                fut.set_result(reason)
+
     # -----------------------------------------------------
     # SIMULATION STEP
     # -----------------------------------------------------
@@ -109,6 +171,25 @@ class Match:
         self.step_units()
         tower_attacks(self)
 
+    def run_tick(self, regen: bool) -> Optional[Player]:
+        """
+        One realtime tick: queued plays, elixir/cooldowns (when regen), simulation.
+        Returns the winner, if any. Synchronous, so it can't interleave with other tasks.
+        """
+        # Queued card plays first, so they join this tick
+        self.apply_queued_placements()
+
+        # Elixir + cooldowns
+        if regen:
+            for p in self.players:
+                p.regen_energy()
+                p.tick_cooldowns()
+
+        # Step simulation
+        self.step_turn()
+
+        return self.check_win()
+
     def check_win(self) -> Optional[Player]:
         dead_king_owner = self.arena.any_king_dead()
         if dead_king_owner is None:
@@ -132,10 +213,49 @@ async def end_match_channel(channel, match: Match, winner: Player, loser: Player
     await channel.send(f"🏆 **{winner.user.display_name} wins the match!**")
 
 
+async def show_arena(channel, match: Match) -> None:
+    """
+    Show the board by editing the match's board message in place (one message,
+    not a new one per render). Skips the render and the API call when nothing changed.
+    """
+    key = (match.arena.revision, tuple(p.energy for p in match.players))
+    if key == match.last_render_key and match.arena_message is not None:
+        return
+    match.last_render_key = key
+
+    rendered = render_arena_emoji(match.arena, match)
+    if rendered == match.last_rendered and match.arena_message is not None:
+        return
+    match.last_rendered = rendered
+
+    if match.arena_message is not None:
+        try:
+            await match.arena_message.edit(content=rendered)
+            return
+        except discord.HTTPException:
+            pass  # deleted / too old: fall back to a fresh message
+
+    match.arena_message = await channel.send(rendered)
+
+
 # =========================================================
 # REALTIME LOOP
 # =========================================================
 
+def _log_render_failure(task: asyncio.Task) -> None:
+    """Done-callback for background renders, so a failed send is logged, not dropped."""
+    if not task.cancelled() and task.exception() is not None:
+        log.error("Board render failed", exc_info=task.exception())
+
+
+async def _stop_render(task: Optional[asyncio.Task]) -> None:
+    """Cancel an in-flight background render and wait until it has stopped."""
+    if task is None or task.done():
+        return
+    task.cancel()
+    await asyncio.wait((task,))
+
+
 async def realtime_loop(bot, channel_id: int, match: Match) -> None:
     """
     Real-time loop:
@@ -143,44 +263,58 @@ async def realtime_loop(bot, channel_id: int, match: Match) -> None:
     - regenerates elixir on a timer
     - renders occasionally (not every tick)
     """
-    channel = bot.get_channel(channel_id)
-    if channel is None:
-        return
+    tick = 0
+    next_render_tick = 0
+    render_task: Optional[asyncio.Task] = None
 
-    last_render = 0.0
-    last_elixir = 0.0
+    # Fixed-rate schedule: sleep until the next deadline instead of a flat
+    # TICK_SECONDS after the work, so tick time doesn't accumulate as drift.
+    next_tick = time.monotonic()
 
     try:
+        channel = bot.get_channel(channel_id)
+        if channel is None:
+            return
+
         while match.active:
-            now = time.monotonic()
-
-            async with match.lock:
-                # Elixir + cooldowns
-                if now - last_elixir >= ELIXIR_EVERY:
-                    last_elixir = now
-                    for p in match.players:
-                        p.regen_energy()
-                        p.tick_cooldowns()
-
-                # Step simulation
-                match.step_turn()
-
-                # Win check
-                winner = match.check_win()
-                if winner:
-                    loser_id = match.opponent_id(winner.user.id)
-                    loser = match.get_player_by_id(loser_id) if loser_id else match.opponent()
-                    await end_match_channel(channel, match, winner, loser)
-                    return
-
-            # Render throttled
-            if now - last_render >= RENDER_EVERY:
-                last_render = now
-                await channel.send(render_arena_emoji(match.arena, match))
-
-            await asyncio.sleep(TICK_SECONDS)
+            next_tick += TICK_SECONDS
+
+            # The loop is the only writer (commands queue placements), so no lock is needed.
+            regen = tick % ELIXIR_TICKS == 0
+            winner = match.run_tick(regen)
+
+            if winner:
+                # No board edit may land after the win message
+                await _stop_render(render_task)
+                loser_id = match.opponent_id(winner.user.id)
+                loser = match.get_player_by_id(loser_id) if loser_id else match.opponent()
+                await end_match_channel(channel, match, winner, loser)
+                return
+
+            # Render throttled, in the background so a slow Discord call can't stall
+            # the tick. Skipped while the previous render is still in flight.
+            if tick >= next_render_tick and (render_task is None or render_task.done()):
+                next_render_tick = tick + RENDER_TICKS
+                render_task = asyncio.create_task(show_arena(channel, match))
+                render_task.add_done_callback(_log_render_failure)
+
+            delay = next_tick - time.monotonic()
+            if delay < -TICK_SECONDS:
+                # Fell badly behind (e.g. event loop stalled): resync, don't burst-catch-up
+                next_tick = time.monotonic()
+                delay = 0.0
+            await asyncio.sleep(max(0.0, delay))
+            tick += 1
 
     except asyncio.CancelledError:
         return
+    finally:
+        # However the loop ends (win, no channel, error), the match is over:
+        # commands must stop queueing, nobody may be left waiting, and no
+        # in-flight render may edit the board afterwards.
+        match.active = False
+        match.reject_queued_placements("❌ No active match.")
+        if render_task is not None:
+            render_task.cancel()
 
 
@@ -1,7 +1,10 @@
 # game/movement.py
 from __future__ import annotations
 
+from itertools import chain
+
 from game.combat import attack_unit, attack_tower
+from game.unit import TowerMarker
 
 
 def step_movement(match) -> None:
@@ -11,74 +14,93 @@ def step_movement(match) -> None:
     """
     arena = match.arena
     old_grid = arena.grid
-    h, w = arena.height, arena.width
-
-    new_grid = [[None for _ in range(w)] for _ in range(h)]
-
-    # 1) Copy towers first (they never move)
-    for r in range(h):
-        for c in range(w):
-            tile = old_grid[r][c]
-            if isinstance(tile, dict) and tile.get("type") == "tower":
-                new_grid[r][c] = tile
-
-    # 2) Move units
-    for r in range(h):
-        for c in range(w):
-            tile = old_grid[r][c]
-            if not isinstance(tile, dict):
-                continue
-            if tile.get("type") == "tower":
-                continue
-
-            owner = tile.get("owner")
-            if owner is None:
-                continue
-
-            # Direction: P1 → right, P2 → left
-            direction = 1 if owner == arena.p1_id else -1
-            nr, nc = r, c + direction
-
-            # Out of bounds → stay
-            if not arena.in_bounds(nr, nc):
-                _stay(new_grid, r, c, tile)
+    w = arena.width
+
+    # Double buffer: build into the arena's spare grid; load_grid() swaps them back.
+    new_grid = arena.back_buffer()
+
+    # 1) Copy towers first (they never move); only live tower cells, no full-grid walk
+    for i in arena.live_tower_indices():
+        new_grid[i] = old_grid[i]
+
+    # 2) Move units: walk the per-owner unit bitmasks, not all W*H cells.
+    # Deterministic order by movement direction: right-movers (P1) front-first
+    # (highest flat index first => high col -> low), then left-movers (everyone
+    # else) front-first (lowest flat index first). Units only move/attack within
+    # their row, so this resolves exactly like a row-major scan.
+    p1_id = arena.p1_id
+    right_movers = _indices_desc(arena.unit_bits(p1_id))
+    left_movers = _indices_asc(arena.enemy_unit_bits(p1_id))
+
+    # Locals for everything the per-unit body touches (LOAD_FAST, not LOAD_GLOBAL/ATTR)
+    _isinstance = isinstance
+    _TowerMarker = TowerMarker
+    _attack_unit = attack_unit
+    _attack_tower = attack_tower
+    # Cells other than a mover's own that may end up holding a unit (for load_grid)
+    targets: list[int] = []
+    append_target = targets.append
+    for direction, movers in ((1, right_movers), (-1, left_movers)):
+        for i in movers:
+            tile = old_grid[i]
+            owner = tile.owner
+            # Same row, next column: only the column can leave the board
+            nc = i % w + direction
+
+            # Out of bounds → stay (here and below, "stay" = keep the unit at i if
+            # that cell is still free; inlined, it runs for every blocked unit)
+            if not (0 <= nc < w):
+                if new_grid[i] is None:
+                    new_grid[i] = tile
                 continue
 
             # Look ahead (prefer new_grid, fallback to old_grid)
-            front = new_grid[nr][nc] or old_grid[nr][nc]
+            ni = i + direction
+            front = new_grid[ni] or old_grid[ni]
 
-            # Empty → move
+            # Empty → move (front is None means new_grid[ni] is free too)
             if front is None:
-                if new_grid[nr][nc] is None:
-                    new_grid[nr][nc] = tile
-                else:
-                    _stay(new_grid, r, c, tile)
+                new_grid[ni] = tile
+                append_target(ni)
                 continue
 
             # Tower → attack tower, stay
-            if isinstance(front, dict) and front.get("type") == "tower":
-                attack_tower(match, tile, front)
-                _stay(new_grid, r, c, tile)
+            if _isinstance(front, _TowerMarker):
+                _attack_tower(match, tile, front)
+                if new_grid[i] is None:
+                    new_grid[i] = tile
                 continue
 
-            # Unit → if enemy, attack, then stay
-            if isinstance(front, dict) and front.get("type") != "tower":
-                if front.get("owner") != owner:
-                    # Materialize target into new_grid if needed
-                    if new_grid[nr][nc] is None:
-                        new_grid[nr][nc] = front
-                    attack_unit(tile, nr, nc, new_grid)
-
-                _stay(new_grid, r, c, tile)
-                continue
-
-            # Fallback → stay
-            _stay(new_grid, r, c, tile)
-
-    arena.grid = new_grid
-
-
-def _stay(grid, r, c, tile) -> None:
-    """Helper: keep unit in place if cell is free."""
-    if grid[r][c] is None:
-        grid[r][c] = tile
+            # Unit (grid holds only None / TowerMarker / Unit) → if enemy, attack, then stay
+            if front.owner != owner:
+                # Materialize target into new_grid if needed
+                if new_grid[ni] is None:
+                    new_grid[ni] = front
+                    append_target(ni)
+                _attack_unit(tile, ni, new_grid)
+
+            if new_grid[i] is None:
+                new_grid[i] = tile
+
+    # Units can only be on a mover's old cell or a target cell: index just those
+    arena.load_grid(new_grid, touched=chain(right_movers, left_movers, targets))
+
+
+def _indices_desc(bits: int) -> list[int]:
+    """Set bit positions of `bits`, highest first."""
+    out = []
+    while bits:
+        i = bits.bit_length() - 1
+        out.append(i)
+        bits ^= 1 << i
+    return out
+
+
+def _indices_asc(bits: int) -> list[int]:
+    """Set bit positions of `bits`, lowest first."""
+    out = []
+    while bits:
+        low = bits & -bits
+        out.append(low.bit_length() - 1)
+        bits ^= low
+    return out
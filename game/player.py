@@ -1,4 +1,7 @@
+import heapq
+
 from game.arena import ARENAS
+from game.card import CARD_OBJECTS
 
 class Player:
     """
@@ -18,13 +21,20 @@ class Player:
         self.energy_regen = 1      # regen per turn
 
         # Cooldowns for cards
-        self.cooldowns = {}  # {card_name: turns_remaining}
+        self.cooldowns = {}  # {card_name: cooldown turn it expires on}
+        self._cooldowns_version = 0   # bumped when the SET of cooled-down cards changes
+        self._cooldown_turn = 0       # cooldown ticks so far
+        self._cooldown_heap = []      # (expiry turn, card_name), soonest first
+
+        # playable_cards() cache: (energy, cooldowns version, deck) -> cards
+        self._playable_key = None
+        self._playable = []
 
         # ---------------------------
         # Progression
         # ---------------------------
-        self.cards = starter_cards.copy()   # unlocked cards
-        self.deck = starter_cards.copy()    # active deck
+        self.cards = list(starter_cards)    # unlocked cards (setter also refreshes cards_set)
+        self.deck = list(starter_cards)     # active deck
         self.coins = 0
         self.wins = 0
         self.trophies = 0
@@ -53,14 +63,53 @@ class Player:
 
     def add_cooldown(self, card_name, turns=2):
         """Put a card on cooldown."""
-        self.cooldowns[card_name] = turns
+        expiry = self._cooldown_turn + max(turns, 1)
+        self.cooldowns[card_name] = expiry
+        heapq.heappush(self._cooldown_heap, (expiry, card_name))
+        self._cooldowns_version += 1
 
     def tick_cooldowns(self):
-        """Reduce cooldown timers each turn."""
-        for name in list(self.cooldowns.keys()):
-            self.cooldowns[name] -= 1
-            if self.cooldowns[name] <= 0:
+        """Advance cooldowns one turn; only cards expiring now are touched."""
+        self._cooldown_turn += 1
+        heap = self._cooldown_heap
+        while heap and heap[0][0] <= self._cooldown_turn:
+            expiry, name = heapq.heappop(heap)
+            # Skip stale entries (card was put on cooldown again since)
+            if self.cooldowns.get(name) == expiry:
                 del self.cooldowns[name]
+                self._cooldowns_version += 1
+
+    def playable_cards(self):
+        """
+        Deck cards playable right now (elixir + cooldowns), as shared Card objects.
+        Cached until energy, the cooled-down set or the deck changes. Don't mutate the result.
+        """
+        key = (self.energy, self._cooldowns_version, tuple(self.deck))
+        if key != self._playable_key:
+            self._playable = [
+                c for name in self.deck
+                if (c := CARD_OBJECTS.get(name)) and c.can_play(self)
+            ]
+            self._playable_key = key
+        return self._playable
+
+    # -----------------------------------------------------
+    # Unlocked cards
+    # -----------------------------------------------------
+
+    @property
+    def cards(self):
+        return self._cards
+
+    @cards.setter
+    def cards(self, value):
+        self._cards = value
+        self._cards_set = frozenset(value)
+
+    @property
+    def cards_set(self):
+        """Unlocked cards as a frozenset (cached; rebuilt when cards is reassigned)."""
+        return self._cards_set
 
     # -----------------------------------------------------
     # Deck helpers
@@ -80,11 +129,9 @@ def get_player(user, players):
     Retrieve or create a Player object for a Discord user.
     """
     if user.id not in players:
-        # Starter cards = Arena 1 unlocks
-        starter = ARENAS[1]["cards"].copy()
-
-        p = Player(user, starter)
-        p.deck = starter[:5]  # ✅ start with 5 cards (Clash-style)
+        # Starter cards = Arena 1 unlocks (Player copies them into its own lists)
+        p = Player(user, ARENAS[1]["cards"])
+        p.deck = p.cards[:5]  # ✅ start with 5 cards (Clash-style)
 
         players[user.id] = p
 
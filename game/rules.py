@@ -22,19 +22,15 @@ def is_player2(arena, owner_id: int) -> bool:
 
 
 # -----------------------------
-# River helpers (arena already has these, but this keeps rules safe)
+# River helpers (Arena always sets river_cols in __init__)
 # -----------------------------
 
 def river_cols(arena) -> tuple[int, int]:
-    cols = getattr(arena, "river_cols", [arena.width // 2 - 1, arena.width // 2])
-    left = min(cols)
-    right = max(cols)
-    return left, right
+    return arena.river_left_col(), arena.river_right_col()
 
 
 def is_river_column(arena, col: int) -> bool:
-    left, right = river_cols(arena)
-    return col == left or col == right
+    return arena.is_river_column(col)
 
 
 # -----------------------------
@@ -59,33 +55,31 @@ def is_on_owner_side(arena, owner_id: int, col: int) -> bool:
     return False
 
 
+def build_deploy_mask(arena, owner_id: int) -> list[bool]:
+    """
+    Flat (row-major) per-cell flags for the STATIC deploy rules:
+    not on river columns and on the owner's side.
+    Cached per owner by Arena.deploy_mask(); the board never changes shape.
+    """
+    left, right = river_cols(arena)
+    side = [
+        not (c == left or c == right) and is_on_owner_side(arena, owner_id, c)
+        for c in range(arena.width)
+    ]
+    return side * arena.height
+
+
 def is_valid_deploy(arena, owner_id: int, row: int, col: int) -> bool:
     """
     True if a unit/building can be deployed here.
     - inside bounds
-    - empty
-    - not on river columns
-    - not on a tower cell
-    - on the owner's side
+    - empty (live tower cells always hold a marker, so this also excludes them)
+    - not on river columns  } precomputed
+    - on the owner's side   } mask
     """
-    if not arena.in_bounds(row, col):
-        return False
-
-    if arena.get(row, col) is not None:
-        return False
-
-    if hasattr(arena, "is_river_column"):
-        if arena.is_river_column(col):
-            return False
-    else:
-        if is_river_column(arena, col):
-            return False
-
-    if hasattr(arena, "is_tower_cell"):
-        if arena.is_tower_cell(row, col):
-            return False
-
-    if not is_on_owner_side(arena, owner_id, col):
+    w = arena.width
+    if not (0 <= row < arena.height and 0 <= col < w):
         return False
 
-    return True
+    i = row * w + col
+    return arena.deploy_mask(owner_id)[i] and arena.grid[i] is None
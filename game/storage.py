@@ -6,18 +6,26 @@ import os
 from typing import Dict, Any
 
 from game.player import Player
-from game.card import cards as CARD_DB
+from game.card import CARD_NAME_SET
 
 STORAGE_FILE = "players.json"
 
 # Global players dict accessible everywhere
 players: Dict[int, Player] = {}
 
+# Unlocked cards for a saved player with none (fallback so Player always has something valid)
+DEFAULT_UNLOCKED = ("knight", "archer", "giant", "mini_pekka", "hog_rider", "baby_dragon", "fireball", "zap")
+
 
 # -----------------------------
 # Helpers
 # -----------------------------
 
+class _StubUser:
+    """Stand-in for a discord user on loaded players (only id/display_name are read)."""
+    __slots__ = ("id", "display_name")
+
+
 def _int(v, default=0) -> int:
     try:
         return int(v)
@@ -25,10 +33,11 @@ def _int(v, default=0) -> int:
         return default
 
 def _valid_card_list(lst) -> list[str]:
-    """Keep only card names that exist in CARD_DB."""
+    """Keep only card names that exist in the card database."""
     if not isinstance(lst, list):
         return []
-    return [c for c in lst if isinstance(c, str) and c in CARD_DB]
+    known = CARD_NAME_SET
+    return [c for c in lst if isinstance(c, str) and c in known]
 
 
 # -----------------------------
@@ -53,9 +62,13 @@ def save_players() -> None:
             "arena": _int(getattr(p, "arena", 1)),
         }
 
+    # json.dumps (not json.dump) with no indent goes through the C encoder in one shot;
+    # compact separators keep the file small as the player count grows.
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
     tmp_file = STORAGE_FILE + ".tmp"
     with open(tmp_file, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+        f.write(payload)
 
     # Atomic replace
     os.replace(tmp_file, STORAGE_FILE)
@@ -68,26 +81,34 @@ def save_players() -> None:
 def load_players() -> Dict[int, Player]:
     """
     Load players from JSON file into the global dict.
-    If file is missing or corrupted, returns empty dict safely.
+    The dict is updated IN PLACE so modules that imported `players` keep seeing it
+    (the bot loads in setup_hook, after the command modules are imported).
+    If file is missing or corrupted, the dict ends up empty.
     """
-    global players
+    loaded = read_players()
+    players.clear()
+    players.update(loaded)
+    return players
 
+
+def read_players() -> Dict[int, Player]:
+    """
+    Parse the JSON file into a NEW dict without touching the global one.
+    If file is missing or corrupted, returns empty dict safely.
+    """
     if not os.path.exists(STORAGE_FILE):
-        players = {}
-        return players
+        return {}
 
     try:
         with open(STORAGE_FILE, "r", encoding="utf-8") as f:
             data = json.load(f)
     except Exception:
-        players = {}
-        return players
+        return {}
 
     if not isinstance(data, dict):
-        players = {}
-        return players
+        return {}
 
-    players = {}
+    loaded: Dict[int, Player] = {}
 
     for uid_str, p_data in data.items():
         uid = _int(uid_str, None)
@@ -97,21 +118,20 @@ def load_players() -> Dict[int, Player]:
             continue
 
         # Dummy user object (you can later replace display_name with real Discord user)
-        user = type("User", (), {})()
+        user = _StubUser()
         user.id = uid
         user.display_name = p_data.get("display_name") or f"User{uid}"
 
         unlocked = _valid_card_list(p_data.get("cards", []))
         if not unlocked:
-            # fallback so Player always has something valid
-            unlocked = ["knight", "archer", "giant", "mini_pekka", "hog_rider", "baby_dragon", "fireball", "zap"]
-            unlocked = _valid_card_list(unlocked)
+            unlocked = _valid_card_list(list(DEFAULT_UNLOCKED))
 
         p = Player(user, unlocked)
 
         deck = _valid_card_list(p_data.get("deck", []))
-        # ensure deck cards are unlocked
-        deck = [c for c in deck if c in p.cards]
+        # ensure deck cards are unlocked (set lookup, not a scan of the card list)
+        unlocked_set = p.cards_set
+        deck = [c for c in deck if c in unlocked_set]
         if len(deck) < 5:
             deck = p.cards[:8]
 
@@ -121,6 +141,6 @@ def load_players() -> Dict[int, Player]:
         p.trophies = _int(p_data.get("trophies", 0))
         p.arena = max(1, _int(p_data.get("arena", 1)))
 
-        players[uid] = p
+        loaded[uid] = p
 
-    return players
+    return loaded
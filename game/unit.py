@@ -1,8 +1,11 @@
 # game/unit.py
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
-from game.card import Card
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, ClassVar, Dict, Union
+
+if TYPE_CHECKING:
+    from game.card import Card
 
 
 # ---- Tile type constants (helps prevent bugs) ----
@@ -10,46 +13,69 @@ TILE_UNIT = "unit"
 TILE_TOWER = "tower"
 
 
+# ---------------------------------------------------------
+# Grid tiles (slotted: fixed fields, fast attribute access; slots=True needs Python 3.10+)
+# ---------------------------------------------------------
+
+@dataclass(slots=True, eq=False)
+class Unit:
+    """
+    A unit/building standing on the grid.
+    Identity matters (Arena indexes tiles by id), hence eq=False.
+    """
+    type: ClassVar[str] = TILE_UNIT
+
+    name: str
+    kind: str           # troop | building
+    owner: int
+    hp: int
+    damage: int
+    range: int
+    speed: int
+    special: str
+    emoji: str
+    status: Dict[str, int] = field(default_factory=dict)   # effect -> ticks left (effects.py)
+
+
+@dataclass(slots=True, eq=False)
+class TowerMarker:
+    """Grid marker for a tower cell. HP/active live in Arena.towers, not here."""
+    type: ClassVar[str] = TILE_TOWER
+
+    owner: int
+    name: str           # left | right | king
+    emoji: str
+
+
+Tile = Union[Unit, TowerMarker]
+
+
 def is_unit(tile: object) -> bool:
-    return isinstance(tile, dict) and tile.get("type") == TILE_UNIT
+    return isinstance(tile, Unit)
 
 
 def is_tower(tile: object) -> bool:
-    return isinstance(tile, dict) and tile.get("type") == TILE_TOWER
+    return isinstance(tile, TowerMarker)
 
 
-def make_unit_from_card(card: Card, owner_id: int) -> Dict[str, Any]:
+def make_unit_from_card(card: Card, owner_id: int) -> Unit:
     """
-    Convert a Card into a GRID UNIT tile dict.
+    Convert a Card into a GRID UNIT tile.
 
     IMPORTANT:
-      - tile["type"] is ALWAYS "unit" (so movement/targeting/combat can rely on it)
-      - card category (troop/building/spell) is stored in tile["kind"]
+      - every Unit has type "unit" (so movement/targeting/combat can rely on it)
+      - card category (troop/building) is stored in unit.kind
     """
-    if card.type == "spell":
-        raise ValueError("Spells do not create units. Handle spells separately.")
-
-    return {
-        "type": TILE_UNIT,        # <--- consistent grid marker
-        "kind": card.type,        # troop | building
-        "name": card.name,
-        "owner": owner_id,
-        "hp": card.hp,
-        "damage": card.damage,
-        "range": card.range,
-        "speed": card.speed,
-        "special": card.special,
-        "emoji": card.emoji,
-    }
+    return card.create_unit(owner_id)
 
 
-def unit_owner(tile: Dict[str, Any]) -> Optional[int]:
-    return tile.get("owner")
+def unit_owner(tile: Unit) -> int:
+    return tile.owner
 
 
-def unit_is_building(tile: Dict[str, Any]) -> bool:
-    return tile.get("kind") == "building"
+def unit_is_building(tile: Unit) -> bool:
+    return tile.kind == "building"
 
 
-def unit_is_troop(tile: Dict[str, Any]) -> bool:
-    return tile.get("kind") == "troop"
+def unit_is_troop(tile: Unit) -> bool:
+    return tile.kind == "troop"
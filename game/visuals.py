@@ -1,26 +1,53 @@
 # game/visuals.py
 from __future__ import annotations
 
-from typing import Optional, Dict, Any, List, Tuple
-from .arena import Arena
+from typing import Optional, Dict, Tuple
+from .arena import Arena, TowerState
+from .unit import Tile
 import os
 from PIL import Image
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 
 # ---------------------------------------------------------
 # DECK IMAGE (unchanged behavior)
 # ---------------------------------------------------------
 
+DECK_CARD_SIZE = (300, 400)
+
+# Shared decode pool for deck renders (threads start lazily, on first use)
+_DECODE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="deck-decode")
+
+
+@lru_cache(maxsize=32)
+def _open_card_image(path):
+    """
+    Decode one card image and scale it to DECK_CARD_SIZE.
+    Cached: card art is static, so repeat deck renders only re-paste. Callers must not mutate the result.
+    """
+    with Image.open(path) as src:
+        # JPEG: let libjpeg decode at a reduced scale (no-op for PNG art).
+        # reducing_gap: cheap integer reduce first, then the real resample.
+        src.draft("RGB", (DECK_CARD_SIZE[0] * 2, DECK_CARD_SIZE[1] * 2))
+        img = src.resize(DECK_CARD_SIZE, reducing_gap=3.0)
+    # Match the deck canvas mode once here (cached), so paste() is a plain copy
+    # instead of converting the tile on every deck render.
+    return img if img.mode == "RGBA" else img.convert("RGBA")
+
+
 def make_deck_image(card_files, output_file="deck.png"):
+    """Paste up to 8 card images into a 4x2 PNG. output_file may be a path or a binary file object."""
     valid_files = [f for f in card_files if os.path.exists(f)]
     if not valid_files:
         return None
 
-    target_size = (300, 400)
-    images = [Image.open(f).resize(target_size) for f in valid_files]
+    # Decode/resize run in Pillow's C code with the GIL released, so the (up to 8)
+    # cards load in parallel. Only 8 slots get pasted below.
+    images = list(_DECODE_POOL.map(_open_card_image, valid_files[:8]))
 
-    w, h = target_size
+    w, h = DECK_CARD_SIZE
     cols, rows = 4, 2
 
     deck = Image.new("RGBA", (w * cols, h * rows), (0, 0, 0, 0))
@@ -30,64 +57,51 @@ def make_deck_image(card_files, output_file="deck.png"):
         y = (i // cols) * h
         deck.paste(img, (x, y))
 
-    deck.save(output_file)
+    # Fast zlib level: this PNG is uploaded once to Discord, size barely matters
+    deck.save(output_file, format="PNG", compress_level=1, optimize=False)
     return output_file
 
 
+async def make_deck_image_async(card_files, output_file="deck.png"):
+    """make_deck_image on a worker thread, so decoding/encoding doesn't block the bot."""
+    return await asyncio.to_thread(make_deck_image, card_files, output_file)
+
+
 # ---------------------------------------------------------
 # TILE → EMOJI
 # ---------------------------------------------------------
 
-def tile_to_emoji(tile: Optional[dict]) -> str:
+def tile_to_emoji(tile: Optional[Tile]) -> str:
     if tile is None:
         return "⬜"
 
-    if not isinstance(tile, dict):
-        return "❓"
-
-    # Terrain-only tiles (spell animation frames, etc.)
-    if "type" not in tile and "emoji" in tile:
-        return tile["emoji"]
-
-    # Towers
-    if tile.get("type") == "tower":
-        if tile.get("name") == "king":
-            return tile.get("emoji", "👑")
-        return tile.get("emoji", "🏰")
-
-    # Units (or anything else dict-like)
-    return tile.get("emoji", "❓")
+    # Units and towers (spell frames are render overlays, never grid tiles)
+    return tile.emoji or "❓"
 
 
 # ---------------------------------------------------------
 # HP BARS
 # ---------------------------------------------------------
 
-def _hp_ratio(current: int, max_hp: int) -> float:
-    if max_hp <= 0:
-        return 0.0
-    return max(0.0, min(1.0, current / max_hp))
-
+# Thresholds are compared as scaled integers (current/max > 0.66 <=> current*100 > 66*max):
+# no float division and no helper call per bar.
 
 def hp_bar_3(current: int, max_hp: int) -> str:
-    ratio = _hp_ratio(current, max_hp)
-
-    if ratio == 0:
+    if max_hp <= 0 or current <= 0:
         return "⬛⬛⬛"
-    if ratio > 0.66:
+    if current * 100 > 66 * max_hp:
         return "🟩🟩🟩"
-    if ratio > 0.33:
+    if current * 100 > 33 * max_hp:
         return "🟨🟨⬛"
     return "🟥⬛⬛"
 
 
 def hp_bar_unit(current: int, max_hp: int) -> str:
-    ratio = _hp_ratio(current, max_hp)
-    if ratio == 0:
+    if max_hp <= 0 or current <= 0:
         return "⬛⬛"
-    if ratio > 0.5:
+    if current * 2 > max_hp:
         return "🟩🟩"
-    if ratio > 0.25:
+    if current * 4 > max_hp:
         return "🟨⬛"
     return "🟥⬛"
 
@@ -96,37 +110,32 @@ def hp_bar_unit(current: int, max_hp: int) -> str:
 # TOWER HP SUMMARY LINES
 # ---------------------------------------------------------
 
+def _tower_bar(t: Optional[TowerState], base_max: int) -> str:
+    if not t:
+        return "⬛⬛⬛"
+    return hp_bar_3(t.hp, base_max)
+
+
+def _tower_side_line(tset: Dict[str, TowerState], label: str) -> str:
+    return (
+        f"{label} "
+        f"L{_tower_bar(tset.get('left'), 1500)} "
+        f"K{_tower_bar(tset.get('king'), 3000)} "
+        f"R{_tower_bar(tset.get('right'), 1500)}"
+    )
+
+
 def collect_tower_hp_lines(arena: Arena) -> list[str]:
-    if not arena.towers:
+    towers = arena.towers
+    if not towers:
         return []
 
+    # Helpers live at module level: no closures rebuilt on every render
     lines: list[str] = []
-
-    p1_id = arena.p1_id
-    p2_id = arena.p2_id
-
-    def one_side(owner_id: int, label: str) -> str:
-        tset: Dict[str, Dict[str, Any]] = arena.towers.get(owner_id, {})
-        left = tset.get("left")
-        right = tset.get("right")
-        king = tset.get("king")
-
-        def bar_or_empty(t: Optional[Dict[str, Any]], base_max: int) -> str:
-            if not t:
-                return "⬛⬛⬛"
-            return hp_bar_3(int(t.get("hp", 0) or 0), base_max)
-
-        return (
-            f"{label} "
-            f"L{bar_or_empty(left, 1500)} "
-            f"K{bar_or_empty(king, 3000)} "
-            f"R{bar_or_empty(right, 1500)}"
-        )
-
-    if p1_id is not None:
-        lines.append(one_side(p1_id, "P1"))
-    if p2_id is not None:
-        lines.append(one_side(p2_id, "P2"))
+    if arena.p1_id is not None:
+        lines.append(_tower_side_line(towers.get(arena.p1_id, {}), "P1"))
+    if arena.p2_id is not None:
+        lines.append(_tower_side_line(towers.get(arena.p2_id, {}), "P2"))
 
     return lines
 
@@ -135,9 +144,18 @@ def collect_tower_hp_lines(arena: Arena) -> list[str]:
 # ELIXIR / ENERGY BARS
 # ---------------------------------------------------------
 
+# max_elixir -> every bar for that cap, indexed by the clamped value (built on first use)
+_ELIXIR_BARS: Dict[int, Tuple[str, ...]] = {}
+
+
 def elixir_bar(current: int, max_elixir: int = 10) -> str:
     current = max(0, min(max_elixir, int(current)))
-    return "🔮" * current + "⚫" * (max_elixir - current)
+    bars = _ELIXIR_BARS.get(max_elixir)
+    if bars is None:
+        bars = _ELIXIR_BARS[max_elixir] = tuple(
+            "🔮" * i + "⚫" * (max_elixir - i) for i in range(max(max_elixir, 0) + 1)
+        )
+    return bars[current]
 
 
 def collect_elixir_lines(match) -> list[str]:
@@ -146,85 +164,34 @@ def collect_elixir_lines(match) -> list[str]:
     We'll display energy as "Elixir" on-screen.
     """
     lines: list[str] = []
-    for idx, p in enumerate(getattr(match, "players", []), start=1):
-        value = getattr(p, "energy", getattr(p, "elixir", 0))
-        lines.append(f"P{idx} Elixir: {elixir_bar(value)}")
+    for idx, p in enumerate(match.players, start=1):
+        lines.append(f"P{idx} Elixir: {elixir_bar(p.energy)}")
     return lines
 
 
 # ---------------------------------------------------------
-# BUILD A TEMP GRID WITH TOWERS OVERLAID (NO STATE MUTATION)
+# EMOJI GRID RENDERING (Clash Royale style)
 # ---------------------------------------------------------
 
-def _grid_with_towers(arena: Arena) -> list[list[Optional[dict]]]:
+@lru_cache(maxsize=8)
+def _terrain_rows(width: int, height: int) -> Tuple[Tuple[str, ...], ...]:
     """
-    Returns a new grid that is arena.grid + tower markers overlaid.
-    Does NOT modify arena.grid.
+    Empty-board emoji per cell (grass / river / bridge), built once per board size.
+    Rendering copies these rows and only overlays occupied cells.
     """
-    grid = [[arena.get(r, c) for c in range(arena.width)] for r in range(arena.height)]
-
-    if not arena.towers:
-        return grid
-
-    for owner_id, tower_set in arena.towers.items():
-        for name, t in tower_set.items():
-            if int(t.get("hp", 0) or 0) <= 0:
-                continue
-            for (r, c) in t.get("cells", []):
-                if arena.in_bounds(r, c):
-                    grid[r][c] = {
-                        "type": "tower",
-                        "owner": owner_id,
-                        "name": name,
-                        "emoji": t.get("emoji", "🏰"),
-                    }
-
-    return grid
-
+    river_cols = [width // 2 - 1, width // 2]
 
-# ---------------------------------------------------------
-# EMOJI GRID RENDERING (Clash Royale style)
-# ---------------------------------------------------------
-
-def render_arena_emoji(arena: Arena, match: Optional[object] = None) -> str:
-    LEFT_PAD = "   "
-
-    DIGIT_BOX = {
-        "0": "0️⃣", "1": "1️⃣", "2": "2️⃣", "3": "3️⃣", "4": "4️⃣",
-        "5": "5️⃣", "6": "6️⃣", "7": "7️⃣", "8": "8️⃣", "9": "9️⃣",
-    }
-
-    def col_header() -> str:
-        digits = [str((i + 1) % 10) for i in range(arena.width)]
-        return LEFT_PAD + "".join(DIGIT_BOX[d] for d in digits)
-
-    def row_prefix(r: int) -> str:
-        return f"{chr(ord('A') + r)}  "
-
-    # Use a temp grid that includes towers, without mutating arena state
-    grid = _grid_with_towers(arena)
-
-    lines: list[str] = []
-
-    river_cols = [arena.width // 2 - 1, arena.width // 2]
-
-    bridge_centers = [arena.height // 4, arena.height - arena.height // 4 - 1]
+    bridge_centers = [height // 4, height - height // 4 - 1]
     bridge_rows = set()
     for br in bridge_centers:
         for rr in (br - 1, br, br + 1):
-            if 0 <= rr < arena.height:
+            if 0 <= rr < height:
                 bridge_rows.add(rr)
 
-    lines.append(col_header())
-    border = LEFT_PAD + ("🟦" * arena.width)
-    lines.append(border)
-
-    for r in range(arena.height):
-        row_tiles: list[str] = []
-
-        for c in range(arena.width):
-            tile = grid[r][c]
-
+    rows = []
+    for r in range(height):
+        row = []
+        for c in range(width):
             # Base terrain
             if c in river_cols:
                 base = "🟦"
@@ -235,28 +202,87 @@ def render_arena_emoji(arena: Arena, match: Optional[object] = None) -> str:
             if (r in bridge_rows) and (c in river_cols):
                 base = "🟫"
 
-            # Overlay unit/tower
-            if tile is not None:
-                base = tile_to_emoji(tile)
+            row.append(base)
+        rows.append(tuple(row))
+    return tuple(rows)
 
-            row_tiles.append(base)
 
-        lines.append(row_prefix(r) + "".join(row_tiles))
+_LEFT_PAD = "   "
+
+# Keycap emoji for digits 0-9, indexed by value
+_DIGIT_BOX = ("0️⃣", "1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣", "8️⃣", "9️⃣")
+
+
+@lru_cache(maxsize=8)
+def _row_prefixes(height: int) -> Tuple[str, ...]:
+    """"A  ", "B  ", ... row labels for a board height, built once."""
+    return tuple(f"{chr(ord('A') + r)}  " for r in range(height))
+
+
+@lru_cache(maxsize=8)
+def _frame_lines(width: int) -> Tuple[str, str]:
+    """(column header, river border) lines for a board width, built once."""
+    header = _LEFT_PAD + "".join(_DIGIT_BOX[(i + 1) % 10] for i in range(width))
+    border = _LEFT_PAD + ("🟦" * width)
+    return header, border
 
-    lines.append(border)
 
-    tower_hp_lines = collect_tower_hp_lines(arena)
-    if tower_hp_lines:
-        lines.append("")
-        lines.extend(tower_hp_lines)
+def render_arena_emoji(
+    arena: Arena,
+    match: Optional[object] = None,
+    overlay: Optional[Dict[Tuple[int, int], str]] = None,
+) -> str:
+    """
+    overlay: optional {(row, col): emoji} drawn on top of everything (spell flashes).
+    """
+    # Start from the cached terrain and splice in only the occupied cells:
+    # units (from the arena's unit index), live towers, then the overlay.
+    rows = [list(row) for row in _terrain_rows(arena.width, arena.height)]
+
+    # Inlined tile_to_emoji: index entries are always Units, never None
+    for r, c, unit in arena.iter_units():
+        rows[r][c] = unit.emoji or "❓"
+
+    for _, _, t in arena.iter_live_towers():
+        for (r, c) in t.cells:
+            if arena.in_bounds(r, c):
+                rows[r][c] = t.emoji
+
+    if overlay:
+        for (r, c), emoji in overlay.items():
+            if arena.in_bounds(r, c):
+                rows[r][c] = emoji
+
+    # One flat list of pieces (cells included), joined once at the end
+    # instead of a string per row plus an outer join.
+    header, border = _frame_lines(arena.width)
+    row_prefixes = _row_prefixes(arena.height)
+    parts: list[str] = ["```text\n", header, "\n", border, "\n"]
+
+    for r, row in enumerate(rows):
+        parts.append(row_prefixes[r])
+        parts.extend(row)
+        parts.append("\n")
+
+    parts.append(border)
+
+    extra = collect_tower_hp_lines(arena)
+    if extra:
+        parts.append("\n")
+        for line in extra:
+            parts.append("\n")
+            parts.append(line)
 
     if match is not None:
-        elixir_lines = collect_elixir_lines(match)
-        if elixir_lines:
-            lines.append("")
-            lines.extend(elixir_lines)
+        extra = collect_elixir_lines(match)
+        if extra:
+            parts.append("\n")
+            for line in extra:
+                parts.append("\n")
+                parts.append(line)
 
-    return "```text\n" + "\n".join(lines) + "\n```"
+    parts.append("\n```")
+    return "".join(parts)
 
 
 def render_arena_ascii(arena: Arena) -> str:
@@ -265,12 +291,11 @@ def render_arena_ascii(arena: Arena) -> str:
     border = "+" + ("-" * arena.width) + "+"
     lines.append(border)
 
-    for r in range(arena.height):
-        row_chars = []
-        for c in range(arena.width):
-            tile = arena.get(r, c)
-            row_chars.append("." if tile is None else "X")
-        lines.append("|" + "".join(row_chars) + "|")
+    # Slice rows straight out of the flat grid (no per-cell arena.get)
+    grid = arena.grid
+    w = arena.width
+    for start in range(0, w * arena.height, w):
+        lines.append("|" + "".join(["." if t is None else "X" for t in grid[start:start + w]]) + "|")
 
     lines.append(border)
 
@@ -283,28 +308,12 @@ def render_arena_ascii(arena: Arena) -> str:
 
 async def animate_spell(ctx, arena: Arena, match, positions, effect: str):
     """
-    Flash spell emojis on top of the rendered board.
-    This temporarily overrides arena.grid for rendering only, then restores it.
+    Flash spell emojis on top of the rendered board, then restore it.
+    The flash is a render overlay; arena.grid is never touched.
+    One message: the restore frame edits the flash message instead of posting again.
     """
-    # Snapshot current grid once
-    base = [[arena.get(r, c) for c in range(arena.width)] for r in range(arena.height)]
-
-    frames = []
-
-    # Frame 1: flash effect
-    temp = [[base[r][c] for c in range(arena.width)] for r in range(arena.height)]
-    for r, c in positions:
-        if arena.in_bounds(r, c):
-            temp[r][c] = {"emoji": effect}
-    frames.append(temp)
-
-    # Frame 2: restore
-    frames.append(base)
-
-    for grid in frames:
-        old = arena.grid
-        arena.grid = grid
-        await ctx.send(render_arena_emoji(arena, match))
-        arena.grid = old
-        await asyncio.sleep(0.3)
+    flash = {(r, c): effect for r, c in positions}
+    msg = await ctx.send(render_arena_emoji(arena, match, flash))
+    await asyncio.sleep(0.15)
 
+    await msg.edit(content=render_arena_emoji(arena, match))